@@ -26,20 +26,52 @@ Modifications:
 - Improved error handling and reporting
 """
 
+import argparse
 import os
 import markdown
 import tempfile
 import yaml
 import re
 import html
+import io
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
 from pathlib import Path
-from git import Repo, RemoteProgress, GitCommandError
+from git import Git, Repo, RemoteProgress, GitCommandError
 from datetime import datetime
 from packaging import version
 from tqdm import tqdm
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
+_ASTRO_BASE = 'https://docs.astro.build/'
+
+_YAML_RESOLVER = yaml.resolver.Resolver()
+_YAML_STR_TAG = yaml.resolver.BaseResolver.DEFAULT_SCALAR_TAG
+
+# Precompiled patterns used while processing every documentation file
+_ALL_IMAGES_RE = re.compile(
+    r'(?P<mdximp>import\s+(?P<mdx_var>\w+)\s+from\s+[\'"](?P<mdx_path>[^\'"]+)[\'"])'
+    r'|(?P<mdimg>!\[(?P<md_alt>.*?)\]\((?P<md_path>[^http].*?)\))'
+    r'|(?P<astroimg><Image\s+src=\{(?P<astro_src>[^}]+)\}\s+alt="(?P<astro_alt>[^"]+)"[^>]*>)'
+)
+_CODE_BLOCK_RE = re.compile(r'```(?:(\w+))?\s*(?:\{([^}]*)\})?\s*(.*?)```', re.DOTALL)
+_CODE_TITLE_RE = re.compile(r'title="([^"]+)"')
+_TITLE_RE = re.compile(r'title:\s*[\'"]?(.*?)(?:[\'"]?\s*$|[\'"]?\s+\w+:)', re.MULTILINE)
+_DESC_RE = re.compile(r'description:\s*[\'"]?(.*?)(?:[\'"]?\s*$|[\'"]?\s+\w+:)', re.MULTILINE)
+# Leading block of import statements, blank lines and default imports already rewritten as images
+_LEADING_IMPORTS_RE = re.compile(
+    r'\A(?:[ \t]*(?:import\s.*|!\[\w*\]\(' + re.escape(_ASTRO_BASE) + r'[^)\n]*\);?)?[ \t]*\r?\n)+'
+)
+_IMPORT_LINE_RE = re.compile(r'^[ \t]*import\s.*\n', re.MULTILINE)
+_FM_FIELD_RE = re.compile(r'^(title|description):(.*)$', re.MULTILINE)
+_FM_SIMPLE_VALUE_RE = re.compile(
+    r'[ \t]+(?:\'([^\'\n]*)\'|"([^"\\\n]*)"|([^\s\'"#&*!|>%@`{}\[\],?:-][^:#\n]*?))[ \t]*\r?'
+)
+_FM_SKIP_RE = re.compile(r'githubIntegrationURL:|label:|maxHeadingLevel:')
+_FM_CLEAN_RE = re.compile(r'\s+i18nReady:\s*true|(?P<block>:\s*\|)')
+
 def get_license_notice():
     """Return a formatted license notice for inclusion in output"""
     return """
@@ -96,38 +128,27 @@ def cleanup_directory(directory):
         print(f"Warning: Failed to clean up directory {directory}: {e}")
 
 
+def _replace_image(match):
+    """Rewrite a single image reference matched by _ALL_IMAGES_RE"""
+    kind = match.lastgroup
+    if kind == 'mdximp':
+        alt = match.group('mdx_var')
+        image_path = match.group('mdx_path')
+    elif kind == 'mdimg':
+        alt = match.group('md_alt')
+        image_path = match.group('md_path')
+    else:
+        alt = match.group('astro_alt')
+        image_path = match.group('astro_src').strip('{}').strip('"\'')
+    image_path = image_path.lstrip('./~')
+    return '![' + alt + '](' + _ASTRO_BASE + image_path + ')'
+
+
 def process_image_paths(md_content):
     """Process both MDX imports and markdown images, including SVGs"""
     try:
-        # Handle MDX image imports
-        mdx_pattern = r'import\s+(\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
-        def mdx_replace(match):
-            var_name = match.group(1)
-            image_path = match.group(2)
-            image_path = re.sub(r'^[./~]+', '', image_path)
-            return f'![{var_name}](https://docs.astro.build/{image_path})'
-        
-        md_content = re.sub(mdx_pattern, mdx_replace, md_content)
-        
-        # Handle standard markdown images and SVGs
-        md_pattern = r'!\[(.*?)\]\(([^http].*?)\)'
-        def md_replace(match):
-            alt_text = match.group(1)
-            image_path = match.group(2)
-            image_path = re.sub(r'^[./~]+', '', image_path)
-            return f'![{alt_text}](https://docs.astro.build/{image_path})'
-        
-        md_content = re.sub(md_pattern, md_replace, md_content)
-        
-        # Handle Astro image components
-        component_pattern = r'<Image\s+src={([^}]+)}\s+alt="([^"]+)"[^>]*>'
-        def component_replace(match):
-            src = match.group(1).strip('{}').strip('"\'')
-            alt = match.group(2)
-            src = re.sub(r'^[./~]+', '', src)
-            return f'![{alt}](https://docs.astro.build/{src})'
-        
-        return re.sub(component_pattern, component_replace, md_content)
+        # MDX imports, markdown images/SVGs and Astro <Image> components in one pass
+        return _ALL_IMAGES_RE.sub(_replace_image, md_content)
     except Exception as e:
         raise DocumentationProcessingError(f"Error processing image paths: {e}")
 
@@ -135,8 +156,6 @@ def process_image_paths(md_content):
 def preprocess_code_blocks(md_content):
     """Handle Astro's code blocks with advanced features"""
     try:
-        pattern = r'```(?:(\w+))?\s*(?:\{([^}]*)\})?\s*(.*?)```'
-        
         def replace(match):
             language = match.group(1) or ''
             attributes = match.group(2) or ''
@@ -145,7 +164,7 @@ def preprocess_code_blocks(md_content):
             # Parse attributes
             title = ''
             if attributes:
-                title_match = re.search(r'title="([^"]+)"', attributes)
+                title_match = _CODE_TITLE_RE.search(attributes)
                 if title_match:
                     title = title_match.group(1)
             
@@ -161,30 +180,32 @@ def preprocess_code_blocks(md_content):
             
             return f'{header_html}\n```{language}\n{code_block.strip()}\n```'
         
-        return re.sub(pattern, replace, md_content, flags=re.DOTALL)
+        return _CODE_BLOCK_RE.sub(replace, md_content)
     except Exception as e:
         raise DocumentationProcessingError(f"Error processing code blocks: {e}")
 
 
-def parse_frontmatter(md_content):
-    """Parse frontmatter with support for Astro's format"""
-    try:
-        lines = md_content.split('\n')
-        if lines[0].strip() == '---':
-            try:
-                end_of_frontmatter = lines[1:].index('---') + 1
-                frontmatter = '\n'.join(lines[1:end_of_frontmatter])
-                content = '\n'.join(lines[end_of_frontmatter + 1:])
-                
-                # Remove import statements from content
-                content = re.sub(r'import.*?\n', '', content)
-                
-                return frontmatter, content
-            except ValueError:
-                return None, md_content
-        return None, md_content
-    except Exception as e:
-        raise DocumentationProcessingError(f"Error parsing frontmatter: {e}")
+def _simple_frontmatter_fields(frontmatter_content):
+    """Return title and description when both are single-line YAML strings.
+
+    Each key must appear once at the top level with a plain or simply quoted
+    value that YAML resolves to a string, so the result is exactly what
+    yaml.safe_load would produce. Returns None otherwise.
+    """
+    fields = {}
+    for match in _FM_FIELD_RE.finditer(frontmatter_content):
+        key = match.group(1)
+        value_match = _FM_SIMPLE_VALUE_RE.fullmatch(match.group(2))
+        if key in fields or not value_match:
+            return None
+        single, double, plain = value_match.groups()
+        if plain is not None:
+            if _YAML_RESOLVER.resolve(yaml.ScalarNode, plain, (True, False)) != _YAML_STR_TAG:
+                return None
+            fields[key] = plain
+        else:
+            fields[key] = single if single is not None else double
+    return fields if len(fields) == 2 else None
 
 
 def safe_load_frontmatter(frontmatter_content):
@@ -194,8 +215,8 @@ def safe_load_frontmatter(frontmatter_content):
 
     try:
         # First pass: try to extract title and description using regex
-        title_match = re.search(r'title:\s*[\'"]?(.*?)(?:[\'"]?\s*$|[\'"]?\s+\w+:)', frontmatter_content, re.MULTILINE)
-        desc_match = re.search(r'description:\s*[\'"]?(.*?)(?:[\'"]?\s*$|[\'"]?\s+\w+:)', frontmatter_content, re.MULTILINE)
+        title_match = _TITLE_RE.search(frontmatter_content)
+        desc_match = _DESC_RE.search(frontmatter_content)
         
         # Initialize metadata with found values
         metadata = {}
@@ -206,11 +227,15 @@ def safe_load_frontmatter(frontmatter_content):
             description = desc_match.group(1).strip(' \'"')
             metadata['description'] = description
 
+        # Title and description are all we render, so skip YAML when it can't change them
+        if metadata == _simple_frontmatter_fields(frontmatter_content):
+            return metadata
+
         # Clean up the frontmatter
         lines = []
         for line in frontmatter_content.split('\n'):
             # Skip problematic lines
-            if any(skip in line for skip in ['githubIntegrationURL:', 'label:', 'maxHeadingLevel:']):
+            if _FM_SKIP_RE.search(line):
                 continue
                 
             # Clean up quotes and URLs
@@ -245,25 +270,44 @@ def safe_load_frontmatter(frontmatter_content):
         return None
 
 
+def _clean_frontmatter_token(match):
+    """Replacement for a single _FM_CLEAN_RE match"""
+    return ': ' if match.group('block') else ''
+
+
 def parse_frontmatter(md_content):
     """Parse frontmatter with improved error handling"""
     try:
-        lines = md_content.split('\n')
-        if lines[0].strip() == '---':
-            try:
-                # Find the closing --- marker
-                end_of_frontmatter = lines[1:].index('---') + 1
-                frontmatter = '\n'.join(lines[1:end_of_frontmatter])
-                content = '\n'.join(lines[end_of_frontmatter + 1:])
-                
-                # Clean up frontmatter
-                frontmatter = re.sub(r'\s+i18nReady:\s*true', '', frontmatter)
-                frontmatter = re.sub(r':\s*\|', ': ', frontmatter)  # Handle YAML block indicators
-                
-                return frontmatter, content
-            except ValueError:
-                return None, md_content
-        return None, md_content
+        # The opening --- marker may carry surrounding whitespace
+        first_newline = md_content.find('\n')
+        if first_newline < 0 or md_content[:first_newline].strip() != '---':
+            return None, md_content
+        start = first_newline + 1
+
+        # Find the closing --- marker, which must sit on a line of its own
+        end = md_content.find('\n---', start - 1)
+        while end >= 0:
+            marker_end = end + 4
+            if marker_end == len(md_content) or md_content[marker_end] in '\r\n':
+                break
+            end = md_content.find('\n---', marker_end)
+        if end < 0:
+            return None, md_content
+
+        frontmatter = md_content[start:end].rstrip('\r')
+        content_start = md_content.find('\n', end + 4)
+        content = md_content[content_start + 1:] if content_start >= 0 else ''
+
+        # Remove MDX import statements from the top of the content, stepping over
+        # default imports that process_image_paths has already rewritten as images
+        leading = _LEADING_IMPORTS_RE.match(content)
+        if leading:
+            content = _IMPORT_LINE_RE.sub('', leading.group(0)) + content[leading.end():]
+
+        # Clean up frontmatter: drop i18nReady flags and YAML block indicators
+        frontmatter = _FM_CLEAN_RE.sub(_clean_frontmatter_token, frontmatter)
+
+        return frontmatter, content
     except Exception as e:
         print(f"Warning: Error in document structure: {e}")
         return None, md_content
@@ -283,8 +327,25 @@ def clone_repo(repo_url, branch, docs_dir, repo_dir):
             return
 
         print("Cloning repository...")
-        os.makedirs(repo_dir, exist_ok=True)
         progress = CloneProgress()
+
+        if Git().version_info >= (2, 25):
+            # Shallow, blobless clone that only checks out the docs directory
+            repo = Repo.clone_from(
+                repo_url,
+                repo_dir,
+                progress=progress,
+                branch=branch,
+                depth=1,
+                filter='blob:none',
+                sparse=True
+            )
+            repo.git.sparse_checkout('set', docs_dir)
+            print("Repository cloned successfully.")
+            return
+
+        # Older git versions lack `git sparse-checkout`, so fetch into a sparse repository
+        os.makedirs(repo_dir, exist_ok=True)
         
         # Initialize repository
         repo = Repo.init(repo_dir)
@@ -313,35 +374,35 @@ def clone_repo(repo_url, branch, docs_dir, repo_dir):
             progress.finalize()
 
 
+def _scan_markdown_files(root_dir, excluded_dirs, dir_parts=()):
+    """Recursively yield (path, sort_key) for markdown files, pruning excluded directories
+
+    dir_parts holds the directory names from the top-level root down to root_dir,
+    so sorting on it keeps every directory's subtree together.
+    """
+    with os.scandir(root_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in excluded_dirs and not entry.name.startswith('_'):
+                    yield from _scan_markdown_files(entry.path, excluded_dirs, dir_parts + (entry.name,))
+            elif entry.is_file() and entry.name.endswith(('.md', '.mdx')):
+                # Prioritize index files within their directories
+                is_index = entry.name == 'index.md'
+                sort_key = (dir_parts, 0 if is_index else 1, entry.name)
+                yield entry.path, sort_key
+
+
 def get_files_sorted(root_dir):
     """Get sorted files with comprehensive filtering"""
     try:
-        all_files = []
         excluded_dirs = {'node_modules', '.git', '_internal', 'dist', 'temp', '__pycache__'}
-        
-        for root, dirs, files in os.walk(root_dir):
-            # Skip excluded directories
-            dirs[:] = [d for d in dirs if d not in excluded_dirs and not d.startswith('_')]
-            
-            for file in files:
-                if file.endswith(('.md', '.mdx')):
-                    full_path = os.path.join(root, file)
-                    
-                    # Skip excluded paths
-                    if any(x in Path(full_path).parts for x in excluded_dirs):
-                        continue
-                        
-                    # Prioritize index files within their directories
-                    is_index = file == 'index.md'
-                    dir_path = os.path.dirname(full_path)
-                    sort_key = f"{dir_path}/{'0' if is_index else '1'}{file}"
-                    all_files.append((full_path, sort_key))
+        all_files = list(_scan_markdown_files(root_dir, excluded_dirs))
         
         if not all_files:
             raise DocumentationProcessingError(f"No markdown files found in {root_dir}")
         
-        all_files.sort(key=lambda x: x[1])
-        return [full_path for full_path, _ in all_files]
+        all_files.sort(key=itemgetter(1))
+        return list(map(itemgetter(0), all_files))
     except Exception as e:
         raise DocumentationProcessingError(f"Error getting sorted files: {e}")
 
@@ -453,17 +514,72 @@ blockquote {
         raise DocumentationProcessingError(f"Failed to create CSS file: {e}")
 
 
-def process_files(files, repo_dir, docs_dir):
+_markdown_converter = None
+
+
+def _get_markdown_converter():
+    """Return this process's Markdown converter, creating it on first use"""
+    global _markdown_converter
+    if _markdown_converter is None:
+        _markdown_converter = markdown.Markdown(
+            extensions=['fenced_code', 'codehilite', 'tables', 'footnotes', 'toc', 'attr_list', 'def_list']
+        )
+    return _markdown_converter
+
+
+def _render_one(item, repo_dir, docs_dir):
+    """Render a single markdown file in a worker process.
+
+    Returns ``(index, page)`` where ``page`` is ``(depth, title, page_html)``,
+    or ``None`` if the file has no usable frontmatter or failed to process.
+    Section numbering is left to the caller so files can be rendered in any order.
+    """
+    index, file_path = item
+    try:
+        with open(file_path, 'rb') as f:
+            md_content = f.read().decode('utf-8')
+
+        md_content = process_image_paths(md_content)
+        md_content = preprocess_code_blocks(md_content)
+        frontmatter, md_content = parse_frontmatter(md_content)
+
+        if not frontmatter:
+            return index, None
+        data = safe_load_frontmatter(frontmatter)
+        if data is None:
+            return index, None
+
+        rel_path = os.path.relpath(file_path, os.path.join(repo_dir, docs_dir))
+        depth = rel_path.count(os.sep)
+
+        if os.path.basename(file_path) == 'index.md' and depth > 0:
+            depth -= 1
+
+        toc_title = data.get('title', Path(file_path).stem.title())
+
+        html_page_content = [
+            f"<div class='doc-path'><p>Documentation path: {Path(file_path).relative_to(Path(repo_dir) / docs_dir).as_posix()}</p></div>"
+        ]
+
+        if 'description' in data:
+            html_page_content.append(f"<p><strong>Description:</strong> {data['description']}</p>")
+            html_page_content.append('<br/>')
+
+        # Convert Markdown to HTML with extended features
+        html_page_content.append(_get_markdown_converter().reset().convert(md_content))
+
+        return index, (depth, toc_title, '\n'.join(html_page_content))
+
+    except Exception as e:
+        print(f"Warning: Error processing file {file_path}: {e}")
+        return index, None
+
+
+def process_files(files, repo_dir, docs_dir, css_content):
     """Process markdown files into HTML with error handling"""
     try:
-        if not os.path.exists('styles.css'):
-            create_default_css()
-            
-        with open('styles.css', 'r', encoding='utf8') as f:
-            css_content = f.read()
-            
-        toc = []
-        html_all_pages_content = []
+        toc_buf = io.StringIO()
+        pages_buf = io.StringIO()
         numbering = [0]
 
         html_header = f"""
@@ -477,64 +593,35 @@ def process_files(files, repo_dir, docs_dir):
         <body>
         """
 
-        for index, file_path in enumerate(files):
-            try:
-                with open(file_path, 'r', encoding='utf8') as f:
-                    md_content = f.read()
-
-                md_content = process_image_paths(md_content)
-                md_content = preprocess_code_blocks(md_content)
-                frontmatter, md_content = parse_frontmatter(md_content)
-
-                if frontmatter:
-                    data = safe_load_frontmatter(frontmatter)
-                    if data is not None:
-                        rel_path = os.path.relpath(file_path, os.path.join(repo_dir, docs_dir))
-                        depth = rel_path.count(os.sep)
-                        
-                        if os.path.basename(file_path) == 'index.md' and depth > 0:
-                            depth -= 1
-                            
-                        indent = '&nbsp;' * 5 * depth
-
-                        while len(numbering) <= depth:
-                            numbering.append(0)
-
-                        numbering[depth] += 1
-                        for i in range(depth + 1, len(numbering)):
-                            numbering[i] = 0
-
-                        toc_numbering = '.'.join(map(str, numbering[:depth + 1]))
-                        toc_title = data.get('title', Path(file_path).stem.title())
-                        toc_full_title = f"{toc_numbering} - {toc_title}"
-                        
-                        toc.append(f"{indent}<a href='#{toc_full_title}'>{toc_full_title}</a><br/>")
-
-                        html_page_content = [
-                            f"<h1 id='{toc_full_title}'>{toc_full_title}</h1>",
-                            f"<div class='doc-path'><p>Documentation path: {Path(file_path).relative_to(Path(repo_dir) / docs_dir).as_posix()}</p></div>"
-                        ]
-
-                        if 'description' in data:
-                            html_page_content.append(f"<p><strong>Description:</strong> {data['description']}</p>")
-                            html_page_content.append('<br/>')
-                        
-                        # Convert Markdown to HTML with extended features
-                        html_page_content.append(markdown.markdown(
-                            md_content,
-                            extensions=['fenced_code', 'codehilite', 'tables', 'footnotes', 'toc', 'attr_list', 'def_list']
-                        ))
-                        
-                        html_all_pages_content.append('\n'.join(html_page_content))
-
-                        if index < len(files) - 1:
-                            html_all_pages_content.append('<div class="page-break"></div>')
-                            
-            except Exception as e:
-                print(f"Warning: Error processing file {file_path}: {e}")
-                continue
+        # Render files in parallel, then number them in their original order
+        render = partial(_render_one, repo_dir=repo_dir, docs_dir=docs_dir)
+        with ProcessPoolExecutor() as executor:
+            for index, page in executor.map(render, enumerate(files), chunksize=8):
+                if page is None:
+                    continue
+                depth, toc_title, page_html = page
+
+                indent = '&nbsp;' * 5 * depth
 
-        if not html_all_pages_content:
+                if len(numbering) <= depth:
+                    numbering.extend([0] * (depth + 1 - len(numbering)))
+
+                numbering[depth] += 1
+                numbering[depth + 1:] = [0] * (len(numbering) - depth - 1)
+
+                toc_numbering = '.'.join(map(str, numbering[:depth + 1]))
+                toc_full_title = f"{toc_numbering} - {toc_title}"
+
+                toc_buf.write(f"{indent}<a href='#{toc_full_title}'>{toc_full_title}</a><br/>")
+
+                pages_buf.write(f"<h1 id='{toc_full_title}'>{toc_full_title}</h1>\n")
+                pages_buf.write(page_html)
+                pages_buf.write('\n')
+
+                if index < len(files) - 1:
+                    pages_buf.write('<div class="page-break"></div>\n')
+
+        if not pages_buf.tell():
             raise DocumentationProcessingError("No content was successfully processed")
 
         # Create table of contents
@@ -543,13 +630,13 @@ def process_files(files, repo_dir, docs_dir):
             <div style="padding-bottom: 20px">
                 <h1>Table of Contents</h1>
             </div>
-            {''.join(toc)}
+            {toc_buf.getvalue()}
         </div>
         <div style="page-break-before: always;">
         """
 
         # Combine all content
-        final_content = '\n'.join(html_all_pages_content)
+        final_content = pages_buf.getvalue()
         html_all_content = f"{html_header}{toc_html}{final_content}</body></html>"
 
         return html_all_content
@@ -558,8 +645,22 @@ def process_files(files, repo_dir, docs_dir):
         raise DocumentationProcessingError(f"Error processing documentation: {e}")
 
 
-def generate_pdf(html_content, output_pdf, format_options=None):
-    """Generate PDF using Playwright with enhanced error handling"""
+def _skip_heavy_resources(route):
+    """Playwright route handler that aborts image, font and media requests"""
+    if route.request.resource_type in {'image', 'font', 'media'}:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def generate_pdf(html_content, output_pdf, format_options=None, keep_images=False):
+    """Generate PDF using Playwright with enhanced error handling
+
+    The HTML is loaded from a temporary file rather than page.set_content, which
+    would JSON-encode the whole document over CDP. Remote images, fonts and
+    media are skipped so rendering isn't held up by downloads; pass
+    keep_images=True to include them in the PDF.
+    """
     default_format = {
         'format': 'A4',
         'margin': {
@@ -571,16 +672,31 @@ def generate_pdf(html_content, output_pdf, format_options=None):
         'print_background': True,
         'display_header_footer': True,
         'header_template': '<div style="font-size: 10px; text-align: right; width: 100%; padding-right: 20px; margin-top: 20px;"><span class="pageNumber"></span> of <span class="totalPages"></span></div>',
-        'footer_template': '<div style="font-size: 10px; text-align: center; width: 100%; margin-bottom: 20px;"><span class="url"></span></div>'
+        'footer_template': '<div style="font-size: 10px; text-align: center; width: 100%; margin-bottom: 20px;">Astro Documentation</div>'
     }
     
     format_options = format_options or default_format
 
     try:
+        # Write the HTML to disk so Chromium loads it directly rather than over CDP
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as tmp:
+            html_path = tmp.name
+            tmp.write(html_content)
+
         playwright = sync_playwright().start()
-        browser = playwright.chromium.launch()
+        # Playwright disables Chromium's sandbox unless asked; keep it on except as root
+        # (e.g. in containers), where it can't start
+        running_as_root = hasattr(os, 'geteuid') and os.geteuid() == 0
+        use_sandbox = not (running_as_root or os.environ.get('ASTRO_PDF_NO_SANDBOX') == '1')
+        browser = playwright.chromium.launch(
+            args=["--disable-dev-shm-usage", "--disable-gpu"],
+            chromium_sandbox=use_sandbox
+        )
         context = browser.new_context()
         page = context.new_page()
+
+        if not keep_images:
+            page.route("**/*", _skip_heavy_resources)
         
         # Set viewport size for consistent rendering
         page.set_viewport_size({"width": 1280, "height": 1024})
@@ -588,12 +704,8 @@ def generate_pdf(html_content, output_pdf, format_options=None):
         # Increase timeouts for better reliability
         page.set_default_timeout(120000)  # 2 minutes
         
-        # Set content and wait for loading
-        page.set_content(html_content, wait_until='networkidle')
-        
-        # Additional waits for content
-        page.wait_for_load_state('networkidle')
-        page.wait_for_load_state('domcontentloaded')
+        # Load the document and wait for it to finish loading
+        page.goto(Path(html_path).as_uri(), wait_until='load')
         
         # Generate PDF
         page.pdf(path=output_pdf, **format_options)
@@ -609,9 +721,23 @@ def generate_pdf(html_content, output_pdf, format_options=None):
             browser.close()
         if 'playwright' in locals():
             playwright.stop()
+        if 'html_path' in locals() and os.path.exists(html_path):
+            os.remove(html_path)
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Generate a PDF from Astro's documentation")
+    parser.add_argument(
+        '--keep-images',
+        action='store_true',
+        help='download and include remote images in the PDF (slower)'
+    )
+    return parser.parse_args(argv)
 
-def main():
+
+def main(argv=None):
     """Main execution function with error handling"""
+    args = parse_args(argv)
     repo_dir = "astro-docs"
     repo_url = "https://github.com/withastro/docs.git"
     branch = "main"
@@ -634,6 +760,9 @@ under certain conditions; see the LICENSE file for details.
             print("Creating default styles.css...")
             create_default_css()
             print("Default CSS file created.")
+
+        with open('styles.css', 'r', encoding='utf8') as f:
+            css_content = f.read()
         
         # Create temporary directory for processing
         temp_dir = tempfile.mkdtemp()
@@ -649,9 +778,6 @@ under certain conditions; see the LICENSE file for details.
         print(f"Found {len(files_to_process)} files to process")
 
         # Create cover page
-        with open('styles.css', 'r', encoding='utf8') as f:
-            css_content = f.read()
-            
         cover_html = f"""
         <!DOCTYPE html>
         <html lang="en">
@@ -672,7 +798,7 @@ under certain conditions; see the LICENSE file for details.
 
         # Process files and generate HTML
         print("Processing documentation files...")
-        html_content = process_files(files_to_process, repo_dir, docs_dir)
+        html_content = process_files(files_to_process, repo_dir, docs_dir, css_content)
         
         # Combine cover and content
         final_html = f"{cover_html}<div class='page-break'></div>{html_content}"
@@ -680,7 +806,7 @@ under certain conditions; see the LICENSE file for details.
 
         # Generate PDF
         print(f"Generating PDF: {output_pdf}")
-        generate_pdf(final_html, output_pdf)
+        generate_pdf(final_html, output_pdf, keep_images=args.keep_images)
         
         print(f"Documentation successfully generated: {output_pdf}")
         